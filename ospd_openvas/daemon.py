@@ -677,6 +677,7 @@ class OSPDopenvas(OSPDaemon):
             loaded = Openvas.load_vts_into_redis()
 
         if loaded:
+            self.nvti.invalidate_feed_version()
             new = self.nvti.get_feed_version()
             if new != old:
                 logger.info(
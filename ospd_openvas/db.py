@@ -9,10 +9,21 @@ import logging
 import sys
 import time
 
-from typing import List, NewType, Optional, Iterable, Iterator, Tuple, Callable
+from itertools import islice
+from typing import (
+    List,
+    NewType,
+    Optional,
+    Iterable,
+    Iterator,
+    Tuple,
+    Callable,
+    Union,
+)
 from urllib import parse
 
 import redis
+from redis.utils import HIREDIS_AVAILABLE
 
 from ospd.errors import RequiredArgument
 from ospd_openvas.errors import OspdOpenvasError
@@ -23,6 +34,11 @@ LIST_FIRST_POS = 0
 LIST_LAST_POS = -1
 LIST_ALL = 0
 
+# Hint for the number of keys examined by each SCAN call.
+SCAN_COUNT = 10000
+# Number of commands sent in a single pipeline when iterating over keys.
+PIPELINE_BATCH_SIZE = 1000
+
 # Possible positions of nvt values in cache list.
 NVT_META_FIELDS = [
     "NVT_FILENAME_POS",
@@ -82,6 +98,11 @@ class OpenvasDB:
                         "It is not recommended in production environments."
                     )
 
+            logger.debug(
+                'Using the %s parser for redis responses.',
+                'hiredis' if HIREDIS_AVAILABLE else 'python',
+            )
+
         return cls._db_address
 
     @classmethod
@@ -137,6 +158,9 @@ class OpenvasDB:
             if ctx.keys(pattern):
                 return (ctx, i)
 
+            # release the connection of the unused context right away
+            ctx.close()
+
         return (None, None)
 
     @staticmethod
@@ -179,6 +203,30 @@ class OpenvasDB:
 
         return ctx.lrange(name, start, end)
 
+    @staticmethod
+    def get_list_items(
+        ctx: RedisCtx,
+        items: Iterable[Tuple[Union[str, bytes], int, int]],
+    ) -> List[Optional[list]]:
+        """Returns the specified ranges of several lists using a single
+        round trip to redis.
+
+        Arguments:
+            ctx: Redis context to use.
+            items: Tuples of key name, first and last range element to get.
+
+        Return a list with the requested elements for each given item, in
+        the same order as the items.
+        """
+        if not ctx:
+            raise RequiredArgument('get_list_items', 'ctx')
+
+        pipe = ctx.pipeline(transaction=False)
+        for name, start, end in items:
+            pipe.lrange(name, start, end)
+
+        return pipe.execute()
+
     @staticmethod
     def get_last_list_item(ctx: RedisCtx, name: str) -> str:
         if not ctx:
@@ -370,6 +418,9 @@ class OpenvasDB:
         """Get all items with index 'index', stored under
         a given pattern.
 
+        The keys are collected with SCAN instead of KEYS, to avoid blocking
+        the redis server while iterating over a large database.
+
         Arguments:
             ctx: Redis context to use.
             pattern: key pattern to match.
@@ -381,7 +432,8 @@ class OpenvasDB:
         if not pattern:
             raise RequiredArgument('get_elem_pattern_by_index', 'pattern')
 
-        return sorted(ctx.keys(pattern))
+        # SCAN may return a key more than once
+        return sorted(set(ctx.scan_iter(match=pattern, count=SCAN_COUNT)))
 
     @classmethod
     def get_filenames_and_oids(
@@ -390,6 +442,10 @@ class OpenvasDB:
         """Get all items with index 'index', stored under
         a given pattern.
 
+        The keys are streamed from SCAN, so they are returned unsorted.
+        The file names are requested in pipelined batches of
+        PIPELINE_BATCH_SIZE keys.
+
         Arguments:
             ctx: Redis context to use.
             pattern: Pattern used for searching the keys
@@ -405,9 +461,30 @@ class OpenvasDB:
         if not parser:
             raise RequiredArgument('get_filenames_and_oids', 'parser')
 
-        items = cls.get_keys_by_pattern(ctx, pattern)
+        def filenames_and_oids():
+            items = ctx.scan_iter(match=pattern, count=SCAN_COUNT)
+            seen = set()
+
+            while True:
+                keys = list(islice(items, PIPELINE_BATCH_SIZE))
+                if not keys:
+                    break
 
-        return ((ctx.lindex(item, 0), parser(item)) for item in items)
+                batch = []
+                for item in keys:
+                    # SCAN may return a key more than once
+                    if item not in seen:
+                        seen.add(item)
+                        batch.append(item)
+
+                pipe = ctx.pipeline(transaction=False)
+                for item in batch:
+                    pipe.lindex(item, LIST_FIRST_POS)
+
+                for item, filename in zip(batch, pipe.execute()):
+                    yield (filename, parser(item))
+
+        return filenames_and_oids()
 
     @staticmethod
     def exists(ctx: RedisCtx, key: str) -> bool:
@@ -448,7 +525,10 @@ class BaseKbDB(BaseDB):
         created to store key-values encoded with utf-8."""
         if utf8_enc:
             ctx = OpenvasDB.create_context(self.index, encoding='utf-8')
-            OpenvasDB.add_single_item(ctx, name, values)
+            try:
+                OpenvasDB.add_single_item(ctx, name, values)
+            finally:
+                ctx.close()
         else:
             OpenvasDB.add_single_item(self.ctx, name, values)
 
@@ -666,6 +746,9 @@ class MainDB(BaseDB):
             if OpenvasDB.get_key_count(ctx, f'internal/{scan_id}'):
                 return KbDB(index, ctx)
 
+            # release the connection of the unused context right away
+            ctx.close()
+
         return None
 
     def check_consistency(self, scan_id) -> Tuple[Optional[KbDB], int]:
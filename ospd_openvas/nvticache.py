@@ -7,9 +7,11 @@
 
 import logging
 
-from typing import List, Dict, Optional, Iterator, Tuple
+from sys import intern
+from itertools import islice
+from typing import List, Dict, Optional, Iterable, Iterator, Tuple
 from pathlib import Path
-from time import time
+from time import monotonic, time
 
 from ospd.errors import RequiredArgument
 from ospd_openvas.errors import OspdOpenvasError
@@ -22,6 +24,32 @@ logger = logging.getLogger(__name__)
 LIST_FIRST_POS = 0
 LIST_LAST_POS = -1
 
+# Time in seconds for which the feed version of the nvti cache is cached.
+FEED_VERSION_CACHE_TIME = 30
+
+# Number of VTs requested from redis at once by NVTICache.get_nvts_bulk
+NVTS_BULK_CHUNK_SIZE = 1000
+
+# Positions of the nvt values in the cache list.
+NVT_FILENAME_POS = NVT_META_FIELDS.index("NVT_FILENAME_POS")
+NVT_TAGS_POS = NVT_META_FIELDS.index("NVT_TAGS_POS")
+NVT_CVES_POS = NVT_META_FIELDS.index("NVT_CVES_POS")
+NVT_XREFS_POS = NVT_META_FIELDS.index("NVT_XREFS_POS")
+NVT_FAMILY_POS = NVT_META_FIELDS.index("NVT_FAMILY_POS")
+NVT_NAME_POS = NVT_META_FIELDS.index("NVT_NAME_POS")
+
+# Keys of the nvt reference values, in the order of the cache list.
+NVT_REFS_KEYS = ('cve', 'bid', 'xref')
+
+# Tags which only take a small set of values. The values are interned, so
+# all VTs share a single string object for each of them.
+NVT_INTERNED_TAG_VALUES = frozenset(
+    ('qod_type', 'solution_type', 'solution_method')
+)
+
+# The nvti cache does not store a description for the VT parameters.
+NVT_PARAM_DESCRIPTION = 'Description'
+
 
 class NVTICache(BaseDB):
     QOD_TYPES = {
@@ -48,6 +76,8 @@ class NVTICache(BaseDB):
         self._ctx = None
         self.index = None
         self._main_db = main_db
+        self._feed_version = None
+        self._feed_version_time = 0.0
 
     @property
     def ctx(self) -> Optional[RedisCtx]:
@@ -60,14 +90,37 @@ class NVTICache(BaseDB):
     def get_feed_version(self) -> Optional[str]:
         """Get feed version of the nvti cache db.
 
+        The feed version is cached for FEED_VERSION_CACHE_TIME seconds.
+
         Returns the feed version or None if the nvt feed isn't available.
         """
+        if (
+            self._feed_version is not None
+            and monotonic() - self._feed_version_time < FEED_VERSION_CACHE_TIME
+        ):
+            return self._feed_version
+
         if not self.ctx:
             # no nvti cache db available yet
             return None
 
         # no feed version for notus otherwise tha would be a contract change
-        return OpenvasDB.get_single_item(self.ctx, NVTI_CACHE_NAME)
+        self._feed_version = OpenvasDB.get_single_item(
+            self.ctx, NVTI_CACHE_NAME
+        )
+        self._feed_version_time = monotonic()
+
+        return self._feed_version
+
+    def invalidate_feed_version(self):
+        """Discard the cached feed version, e.g. after loading a new feed
+        into the nvti cache."""
+        self._feed_version = None
+
+    def flush(self):
+        """Flush the database"""
+        super().flush()
+        self.invalidate_feed_version()
 
     def get_oids(self) -> Iterator[Tuple[str, str]]:
         """Get the list of NVT file names and OIDs.
@@ -94,29 +147,42 @@ class NVTICache(BaseDB):
         Returns:
             A dictionary with preferences and timeout.
         """
-        prefs = self.get_nvt_prefs(oid)
+        return self._parse_params(self.get_nvt_prefs(oid), oid)
+
+    @staticmethod
+    def _parse_params(
+        prefs: Optional[List[str]], oid: str
+    ) -> Dict[str, Dict[str, str]]:
+        """Parse the preferences of a VT as stored in the nvti cache.
+
+        Arguments:
+            prefs: List of preferences in the `id|||name|||type|||default`
+                format.
+            oid: VT OID. Only used for logging in error case.
 
+        Returns:
+            A dictionary with the VT parameters.
+        """
         vt_params = {}
 
         if prefs:
             for nvt_pref in prefs:
-                elem = nvt_pref.split('|||')
-
-                param_id = elem[0]
-                param_name = elem[1]
-                param_type = elem[2]
-
-                vt_params[param_id] = dict()
-                vt_params[param_id]['id'] = param_id
-                vt_params[param_id]['type'] = param_type
-                vt_params[param_id]['name'] = param_name.strip()
-                vt_params[param_id]['description'] = 'Description'
-
-                if len(elem) > 3:
-                    param_default = elem[3]
-                    vt_params[param_id]['default'] = param_default
-                else:
-                    vt_params[param_id]['default'] = ''
+                elem = nvt_pref.split('|||', 3)
+                if len(elem) < 3:
+                    logger.error(
+                        'Preference %s in %s is invalid.', nvt_pref, oid
+                    )
+                    continue
+
+                param_id, param_name, param_type, *param_default = elem
+
+                vt_params[param_id] = {
+                    'id': param_id,
+                    'type': param_type,
+                    'name': param_name.strip(),
+                    'description': NVT_PARAM_DESCRIPTION,
+                    'default': param_default[0] if param_default else '',
+                }
 
         return vt_params
 
@@ -132,13 +198,14 @@ class NVTICache(BaseDB):
             A dictionary with the tags.
         """
         tags_dict = dict()
-        tags = tags_str.split('|')
-        for tag in tags:
-            try:
-                _tag, _value = tag.split('=', 1)
-            except ValueError:
+        for tag in tags_str.split('|'):
+            _tag, sep, _value = tag.partition('=')
+            if not sep:
                 logger.error('Tag %s in %s has no value.', tag, oid)
                 continue
+            _tag = intern(_tag)
+            if _tag in NVT_INTERNED_TAG_VALUES:
+                _value = intern(_value)
             tags_dict[_tag] = _value
 
         return tags_dict
@@ -152,45 +219,151 @@ class NVTICache(BaseDB):
         Returns:
             A dictionary with the VT metadata.
         """
-        resp = OpenvasDB.get_list_item(
-            self.ctx,
-            f"nvt:{oid}",
-            start=NVT_META_FIELDS.index("NVT_FILENAME_POS"),
-            end=NVT_META_FIELDS.index("NVT_NAME_POS"),
+        resp, prefs = OpenvasDB.get_list_items(
+            self.ctx, self._get_metadata_items(oid)
         )
 
         if not isinstance(resp, list) or len(resp) == 0:
             return None
 
-        subelem = [
-            'filename',
-            'required_keys',
-            'mandatory_keys',
-            'excluded_keys',
-            'required_udp_ports',
-            'required_ports',
-            'dependencies',
-            'tag',
-            'cve',
-            'bid',
-            'xref',
-            'category',
-            'family',
-            'name',
+        return self._parse_metadata(resp, prefs, oid)
+
+    @staticmethod
+    def _get_nvt_key(oid: str) -> bytes:
+        """Get the key name of the NVT list of a VT as bytes, which the
+        redis client sends without encoding it again.
+        """
+        return b'nvt:' + oid.encode()
+
+    @classmethod
+    def _get_metadata_items(cls, oid: str) -> List[Tuple[bytes, int, int]]:
+        """Get the lists to request from the nvti cache for the metadata
+        of a VT: the NVT list and the NVT preferences.
+
+        The key names are built as bytes, which the redis client sends
+        without encoding them again.
+
+        Arguments:
+            oid: OID of the VT.
+
+        Returns:
+            A list of key name, first and last range element tuples.
+        """
+        return [
+            (cls._get_nvt_key(oid), NVT_FILENAME_POS, NVT_NAME_POS),
+            (
+                b'oid:' + oid.encode() + b':prefs',
+                LIST_FIRST_POS,
+                LIST_LAST_POS,
+            ),
         ]
 
-        custom = dict()
-        custom['refs'] = dict()
-        for child, res in zip(subelem, resp):
-            if child not in ['cve', 'bid', 'xref', 'tag'] and res:
-                custom[child] = res
-            elif child == 'tag':
-                custom.update(self._parse_metadata_tags(res, oid))
-            elif child in ['cve', 'bid', 'xref'] and res:
-                custom['refs'][child] = res.split(", ")
+    def get_nvts_bulk(
+        self, oids: Iterable[str], chunk: int = NVTS_BULK_CHUNK_SIZE
+    ) -> Iterator[Tuple[str, Optional[Dict[str, str]]]]:
+        """Get the metadata of several NVTs.
+
+        The metadata and preferences of up to `chunk` NVTs are requested
+        from redis with a single round trip.
+
+        Arguments:
+            oids: OIDs of the VTs from which to get the metadata.
+            chunk: Number of VTs to request at once.
+
+        Returns:
+            An iterator of tuples of oid and the VT metadata as returned by
+            get_nvt_metadata.
+        """
+        if not self.ctx:
+            return
+
+        oids = iter(oids)
+        while True:
+            oids_chunk = list(islice(oids, chunk))
+            if not oids_chunk:
+                break
 
-        custom['vt_params'] = dict()
-        custom['vt_params'].update(self.get_nvt_params(oid))
+            items = []
+            for oid in oids_chunk:
+                items.extend(self._get_metadata_items(oid))
+
+            resp = OpenvasDB.get_list_items(self.ctx, items)
+
+            for oid, metadata, prefs in zip(oids_chunk, resp[::2], resp[1::2]):
+                if not isinstance(metadata, list) or len(metadata) == 0:
+                    yield (oid, None)
+                    continue
+
+                yield (oid, self._parse_metadata(metadata, prefs, oid))
+
+    @classmethod
+    def _parse_metadata(
+        cls, resp: List[str], prefs: Optional[List[str]], oid: str
+    ) -> Optional[Dict[str, str]]:
+        """Build the VT metadata dictionary from the nvti cache entries.
+
+        Arguments:
+            resp: The NVT list as stored in the nvti cache.
+            prefs: The NVT preferences as stored in the nvti cache.
+            oid: VT OID. Only used for logging in error case.
+
+        Returns:
+            A dictionary with the VT metadata or None if the NVT list is
+            incomplete.
+        """
+        if len(resp) != NVT_NAME_POS + 1:
+            logger.error('Metadata of %s is incomplete.', oid)
+            return None
+
+        (
+            filename,
+            required_keys,
+            mandatory_keys,
+            excluded_keys,
+            required_udp_ports,
+            required_ports,
+            dependencies,
+            tags,
+            cves,
+            bids,
+            xrefs,
+            category,
+            family,
+            name,
+        ) = resp
+
+        refs = dict()
+        custom = {'refs': refs}
+        if filename:
+            custom['filename'] = filename
+        if required_keys:
+            custom['required_keys'] = required_keys
+        if mandatory_keys:
+            custom['mandatory_keys'] = mandatory_keys
+        if excluded_keys:
+            custom['excluded_keys'] = excluded_keys
+        if required_udp_ports:
+            custom['required_udp_ports'] = required_udp_ports
+        if required_ports:
+            custom['required_ports'] = required_ports
+        if dependencies:
+            custom['dependencies'] = dependencies
+        if tags:
+            custom.update(cls._parse_metadata_tags(tags, oid))
+        if cves:
+            refs['cve'] = cves.split(", ")
+        if bids:
+            refs['bid'] = bids.split(", ")
+        if xrefs:
+            refs['xref'] = xrefs.split(", ")
+        if category:
+            custom['category'] = category
+        if family:
+            custom['family'] = family
+        if name:
+            custom['name'] = name
+
+        custom['vt_params'] = cls._parse_params(prefs, oid)
 
         return custom
 
@@ -206,17 +379,15 @@ class NVTICache(BaseDB):
         resp = OpenvasDB.get_list_item(
             self.ctx,
             f"nvt:{oid}",
-            start=NVT_META_FIELDS.index("NVT_CVES_POS"),
-            end=NVT_META_FIELDS.index("NVT_XREFS_POS"),
+            start=NVT_CVES_POS,
+            end=NVT_XREFS_POS,
         )
 
         if not isinstance(resp, list) or len(resp) == 0:
             return None
 
-        subelem = ['cve', 'bid', 'xref']
-
         refs = dict()
-        for child, res in zip(subelem, resp):
+        for child, res in zip(NVT_REFS_KEYS, resp):
             refs[child] = res.split(", ")
 
         return refs
@@ -232,9 +403,41 @@ class NVTICache(BaseDB):
         return OpenvasDB.get_single_item(
             self.ctx,
             f"nvt:{oid}",
-            index=NVT_META_FIELDS.index("NVT_FAMILY_POS"),
+            index=NVT_FAMILY_POS,
         )
 
+    def get_nvt_families(
+        self, oids: Iterable[str], chunk: int = NVTS_BULK_CHUNK_SIZE
+    ) -> Iterator[Tuple[str, Optional[str]]]:
+        """Get the family of several NVTs.
+
+        The families of up to `chunk` NVTs are requested from redis with a
+        single round trip.
+
+        Arguments:
+            oids: OIDs of the VTs from which to get the VT family.
+            chunk: Number of VTs to request at once.
+
+        Returns:
+            An iterator of tuples of oid and VT family.
+        """
+        oids = iter(oids)
+        while True:
+            oids_chunk = list(islice(oids, chunk))
+            if not oids_chunk:
+                break
+
+            resp = OpenvasDB.get_list_items(
+                self.ctx,
+                [
+                    (self._get_nvt_key(oid), NVT_FAMILY_POS, NVT_FAMILY_POS)
+                    for oid in oids_chunk
+                ],
+            )
+
+            for oid, family in zip(oids_chunk, resp):
+                yield (oid, family[0] if family else None)
+
     def get_nvt_prefs(self, oid: str) -> Optional[List[str]]:
         """Get NVT preferences.
 
@@ -262,11 +465,10 @@ class NVTICache(BaseDB):
         tag = OpenvasDB.get_single_item(
             self.ctx,
             f"nvt:{oid}",
-            index=NVT_META_FIELDS.index('NVT_TAGS_POS'),
+            index=NVT_TAGS_POS,
         )
-        tags = tag.split('|')
 
-        return dict([item.split('=', 1) for item in tags])
+        return self._parse_metadata_tags(tag, oid)
 
     def get_nvt_files_count(self) -> int:
         return OpenvasDB.get_key_count(self.ctx, "filename:*")
@@ -13,7 +13,7 @@ import logging
 import binascii
 
 from enum import IntEnum
-from typing import Callable, Optional, Dict, List, Tuple
+from typing import Any, Callable, Optional, Dict, List, Tuple
 from base64 import b64decode
 
 from ospd.scan import ScanCollection, ScanStatus
@@ -92,6 +92,7 @@ class PreferenceHandler:
 
         self._target_options = None
         self._nvts_params = None
+        self._openvas_settings = None
 
         self.nvti = nvticache
         if is_handled_by_notus:
@@ -123,6 +124,16 @@ class PreferenceHandler:
         )
         return self._target_options
 
+    @property
+    def openvas_settings(self) -> Dict[str, Any]:
+        """Return the settings of the openvas executable. They are read
+        only once per scan, since each read forks an openvas process."""
+        if self._openvas_settings is not None:
+            return self._openvas_settings
+
+        self._openvas_settings = Openvas.get_settings()
+        return self._openvas_settings
+
     def _get_vts_in_groups(
         self,
         filters: List[str],
@@ -146,8 +157,7 @@ class PreferenceHandler:
         # Same here. Only check for families in NVT Cache.
         # If necessary, consider to call get_advisory_famaly from
         # Notus class
-        for _, oid in oids:
-            family = self.nvti.get_nvt_family(oid)
+        for oid, family in self.nvti.get_nvt_families(oid for _, oid in oids):
             if family not in families:
                 families[family] = list()
 
@@ -427,7 +437,7 @@ class PreferenceHandler:
 
     def prepare_alive_test_option_for_openvas(self):
         """Set alive test option. Overwrite the scan config settings."""
-        settings = Openvas.get_settings()
+        settings = self.openvas_settings
         if settings and (
             self.target_options.get('alive_test')
             or self.target_options.get('alive_test_methods')
@@ -440,7 +450,7 @@ class PreferenceHandler:
     def prepare_boreas_alive_test(self):
         """Set alive_test for Boreas if boreas scanner config
         (BOREAS_SETTING_NAME) was set"""
-        settings = Openvas.get_settings()
+        settings = self.openvas_settings
         alive_test = None
         alive_test_ports = None
         target_options = self.target_options
@@ -11,7 +11,7 @@ from typing import Any, Optional, Dict, List, Tuple, Iterator
 from itertools import chain
 
 from ospd.cvss import CVSS
-from ospd_openvas.nvticache import NVTICache
+from ospd_openvas.nvticache import NVTICache, NVTS_BULK_CHUNK_SIZE
 from ospd_openvas.notus import Notus
 
 logger = logging.getLogger(__name__)
@@ -32,6 +32,13 @@ class VtHelper:
         else:
             custom = self.nvti.get_nvt_metadata(vt_id)
 
+        return self._get_vt_from_metadata(vt_id, custom, oids)
+
+    def _get_vt_from_metadata(
+        self, vt_id: str, custom: Optional[Dict[str, Any]], oids=None
+    ) -> Optional[Dict[str, Any]]:
+        """Build the VT dictionary from the metadata of a VT as returned
+        by the Notus or the NVTI cache."""
         if not custom:
             return None
 
@@ -190,11 +197,38 @@ class VtHelper:
                 oids = dict(vt_collection)
 
         vt_selection.sort()
-        for vt_id in vt_selection:
-            vt = self.get_single_vt(vt_id, oids)
+        for vt_id, custom in self._get_metadata_iterator(vt_selection):
+            vt = self._get_vt_from_metadata(vt_id, custom, oids)
             if vt:
                 yield (vt_id, vt)
 
+    def _get_metadata_iterator(
+        self, vt_selection: List[str]
+    ) -> Iterator[Tuple[str, Optional[Dict[str, Any]]]]:
+        """Yield the metadata of the selected vts in the given order.
+
+        Notus advisories take precedence. The remaining vts are requested
+        from the NVTI cache in batches instead of one by one.
+        """
+        for i in range(0, len(vt_selection), NVTS_BULK_CHUNK_SIZE):
+            chunk = vt_selection[i : i + NVTS_BULK_CHUNK_SIZE]
+
+            metadata = {}
+            if self.notus:
+                for vt_id in chunk:
+                    nr = self.notus.get_nvt_metadata(vt_id)
+                    if nr:
+                        metadata[vt_id] = nr
+
+            nvt_ids = [vt_id for vt_id in chunk if vt_id not in metadata]
+            metadata.update(self.nvti.get_nvts_bulk(nvt_ids))
+
+            for vt_id in chunk:
+                # The metadata is consumed while building the vt, and a vt
+                # may be selected more than once.
+                custom = metadata.get(vt_id)
+                yield (vt_id, dict(custom) if custom else custom)
+
     def vt_verification_string_iter(self) -> str:
         # for a reproducible hash calculation
         # the vts must already be sorted in the dictionary.
@@ -153,6 +153,9 @@ class DummyDaemon(OSPDopenvas):
                 'xref': ['URL:http://www.mantisbt.org/'],
             },
         }
+        nvti.get_nvts_bulk.side_effect = lambda oids: (
+            (oid, nvti.get_nvt_metadata(oid)) for oid in oids
+        )
         nvti.get_feed_version.return_value = '123'
 
         super().__init__(
@@ -110,6 +110,23 @@ class TestOpenvasDB(TestCase):
         self.assertEqual(ret, ['1234'])
         assert_called(ctx.lrange)
 
+    def test_get_list_items(self, mock_redis):
+        ctx = mock_redis.from_url.return_value
+        pipeline = ctx.pipeline.return_value
+        pipeline.execute.return_value = [['a', 'b'], ['c']]
+
+        ret = OpenvasDB.get_list_items(ctx, [('foo', 0, 1), ('bar', 0, -1)])
+
+        self.assertEqual(ret, [['a', 'b'], ['c']])
+        ctx.pipeline.assert_called_once_with(transaction=False)
+        pipeline.lrange.assert_any_call('foo', 0, 1)
+        pipeline.lrange.assert_any_call('bar', 0, -1)
+        pipeline.execute.assert_called_once_with()
+
+    def test_get_list_items_error(self, mock_redis):
+        with self.assertRaises(RequiredArgument):
+            OpenvasDB.get_list_items(None, [('foo', 0, -1)])
+
     def test_get_last_list_item(self, mock_redis):
         ctx = mock_redis.from_url.return_value
         ctx.rpop.return_value = 'foo'
@@ -281,12 +298,32 @@ class TestOpenvasDB(TestCase):
             return item[4:]
 
         ctx = mock_redis.from_url.return_value
-        ctx.keys.return_value = ['nvt:1', 'nvt:2']
-        ctx.lindex.side_effect = ['aa', 'ab']
+        ctx.scan_iter.return_value = iter(['nvt:1', 'nvt:2', 'nvt:1'])
+        pipeline = ctx.pipeline.return_value
+        pipeline.execute.return_value = ['aa', 'ab']
+
+        ret = OpenvasDB.get_filenames_and_oids(ctx, "nvt:*", _pars)
+
+        self.assertEqual(list(ret), [('aa', '1'), ('ab', '2')])
+        self.assertEqual(pipeline.lindex.call_count, 2)
+        pipeline.lindex.assert_any_call('nvt:1', 0)
+        pipeline.lindex.assert_any_call('nvt:2', 0)
+        pipeline.execute.assert_called_once_with()
+
+    @patch('ospd_openvas.db.PIPELINE_BATCH_SIZE', 1)
+    def test_get_filenames_and_oids_batched(self, mock_redis):
+        def _pars(item):
+            return item[4:]
+
+        ctx = mock_redis.from_url.return_value
+        ctx.scan_iter.return_value = iter(['nvt:1', 'nvt:2'])
+        pipeline = ctx.pipeline.return_value
+        pipeline.execute.side_effect = [['aa'], ['ab']]
 
         ret = OpenvasDB.get_filenames_and_oids(ctx, "nvt:*", _pars)
 
         self.assertEqual(list(ret), [('aa', '1'), ('ab', '2')])
+        self.assertEqual(pipeline.execute.call_count, 2)
 
     def test_get_keys_by_pattern_error(self, mock_redis):
         ctx = mock_redis.from_url.return_value
@@ -299,12 +336,13 @@ class TestOpenvasDB(TestCase):
 
     def test_get_keys_by_pattern(self, mock_redis):
         ctx = mock_redis.from_url.return_value
-        ctx.keys.return_value = ['nvt:2', 'nvt:1']
+        ctx.scan_iter.return_value = ['nvt:2', 'nvt:1', 'nvt:2']
 
         ret = OpenvasDB.get_keys_by_pattern(ctx, 'nvt:*')
 
         # Return sorted list
         self.assertEqual(ret, ['nvt:1', 'nvt:2'])
+        ctx.scan_iter.assert_called_with(match='nvt:*', count=10000)
 
     def test_get_key_count(self, mock_redis):
         ctx = mock_redis.from_url.return_value
@@ -348,6 +386,7 @@ class TestOpenvasDB(TestCase):
 
         self.assertIsNone(new_ctx)
         self.assertIsNone(index)
+        self.assertEqual(ctx.close.call_count, 123)
 
     @patch('ospd_openvas.db.Openvas')
     def test_find_database_by_pattern(
@@ -369,6 +408,7 @@ class TestOpenvasDB(TestCase):
 
         self.assertEqual(new_ctx, ctx)
         self.assertEqual(index, 2)
+        self.assertEqual(ctx.close.call_count, 2)
 
 
 @patch('ospd_openvas.db.OpenvasDB')
@@ -517,6 +557,22 @@ class KbDBTestCase(TestCase):
         mock_openvas_db.add_single_item.assert_called_with(
             ctx, 'internal/scan_id/scanprefs', prefs
         )
+        ctx.close.assert_called_once_with()
+
+    @patch('ospd_openvas.db.OpenvasDB')
+    def test_add_credentials_to_scan_preferences_error(
+        self, mock_redis, mock_openvas_db
+    ):
+        ctx = mock_redis.from_url.return_value
+        mock_openvas_db.create_context.return_value = ctx
+        mock_openvas_db.add_single_item.side_effect = RequiredArgument(
+            'add_single_item', 'values'
+        )
+
+        with self.assertRaises(RequiredArgument):
+            self.db.add_credentials_to_scan_preferences('scan_id', [])
+
+        ctx.close.assert_called_once_with()
 
     def test_add_scan_process_id(self, mock_openvas_db):
         self.db.add_scan_process_id(123)
@@ -751,7 +807,7 @@ class MainDBTestCase(TestCase):
     ):
         ctx = mock_redis.from_url.return_value
 
-        new_ctx = 'bar'  # just some object to compare
+        new_ctx = MagicMock()
         mock_openvas_db.create_context.return_value = new_ctx
         mock_openvas_db.get_key_count.return_value = None
 
@@ -765,12 +821,13 @@ class MainDBTestCase(TestCase):
         )
 
         self.assertIsNone(kbdb)
+        new_ctx.close.assert_called_once_with()
 
     @patch('ospd_openvas.db.OpenvasDB')
     def test_find_kb_database_by_scan_id(self, mock_openvas_db, mock_redis):
         ctx = mock_redis.from_url.return_value
 
-        new_ctx = 'foo'  # just some object to compare
+        new_ctx = MagicMock()
         mock_openvas_db.create_context.return_value = new_ctx
         mock_openvas_db.get_key_count.side_effect = [0, 1]
 
@@ -784,3 +841,4 @@ class MainDBTestCase(TestCase):
         )
         self.assertEqual(kbdb.index, 2)
         self.assertIs(kbdb.ctx, new_ctx)
+        new_ctx.close.assert_called_once_with()
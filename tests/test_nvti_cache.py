@@ -9,6 +9,7 @@
 """Unit Test for ospd-openvas"""
 
 import logging
+import sys
 
 from unittest import TestCase
 from unittest.mock import patch, Mock, PropertyMock
@@ -16,7 +17,7 @@ from pathlib import Path
 
 from ospd_openvas.nvticache import NVTICache, NVTI_CACHE_NAME
 
-from tests.helper import assert_called
+from tests.helper import assert_called, assert_called_once
 
 
 @patch('ospd_openvas.nvticache.OpenvasDB')
@@ -46,6 +47,26 @@ class TestNVTICache(TestCase):
         self.assertEqual(resp, '1234')
         MockOpenvasDB.get_single_item.assert_called_with('foo', NVTI_CACHE_NAME)
 
+    def test_get_feed_version_cached(self, MockOpenvasDB):
+        MockOpenvasDB.get_single_item.return_value = '1234'
+
+        self.assertEqual(self.nvti.get_feed_version(), '1234')
+        self.assertEqual(self.nvti.get_feed_version(), '1234')
+        assert_called_once(MockOpenvasDB.get_single_item)
+
+        MockOpenvasDB.get_single_item.return_value = '1235'
+        self.nvti.invalidate_feed_version()
+
+        self.assertEqual(self.nvti.get_feed_version(), '1235')
+
+    @patch('ospd_openvas.nvticache.monotonic')
+    def test_get_feed_version_expired(self, mock_monotonic, MockOpenvasDB):
+        MockOpenvasDB.get_single_item.side_effect = ['1234', '1235']
+        mock_monotonic.side_effect = [100.0, 131.0, 131.0]
+
+        self.assertEqual(self.nvti.get_feed_version(), '1234')
+        self.assertEqual(self.nvti.get_feed_version(), '1235')
+
     def test_get_feed_version_not_available(self, MockOpenvasDB):
         pmock = PropertyMock(return_value=123)
         type(self.db).max_database_index = pmock
@@ -102,6 +123,17 @@ class TestNVTICache(TestCase):
 
         self.assertEqual(ret, {'tag1': 'value1', 'foo': 'bar'})
 
+    def test_parse_metadata_tags_interned(self, MockOpenvasDB):
+        tags = 'qod_type=' + ''.join(['pack', 'age'])
+        ret = (
+            NVTICache._parse_metadata_tags(  # pylint: disable=protected-access
+                tags, '1.2.3'
+            )
+        )
+
+        self.assertEqual(ret, {'qod_type': 'package'})
+        self.assertIs(ret['qod_type'], sys.intern('package'))
+
     def test_get_nvt_params(self, MockOpenvasDB):
         prefs1 = ['1|||dns-fuzz.timelimit|||entry|||default']
         prefs2 = ['1|||dns-fuzz.timelimit|||entry|||']
@@ -142,6 +174,30 @@ class TestNVTICache(TestCase):
         resp = self.nvti.get_nvt_params('1.2.3.4')
         self.assertEqual(resp, out_dict2)
 
+    def test_get_nvt_params_invalid(self, MockOpenvasDB):
+        logging.Logger.error = Mock()
+
+        MockOpenvasDB.get_list_item.return_value = [
+            '1|||dns-fuzz.timelimit',
+            '2|||foo|||entry|||a|||b',
+        ]
+
+        resp = self.nvti.get_nvt_params('1.2.3.4')
+
+        self.assertEqual(
+            resp,
+            {
+                '2': {
+                    'id': '2',
+                    'type': 'entry',
+                    'default': 'a|||b',
+                    'name': 'foo',
+                    'description': 'Description',
+                },
+            },
+        )
+        assert_called(logging.Logger.error)
+
     def test_get_nvt_metadata(self, MockOpenvasDB):
         metadata = [
             'mantis_detect.nasl',
@@ -210,17 +266,80 @@ class TestNVTICache(TestCase):
             '1|||dns-fuzz.timelimit|||entry|||default',
         ]
 
-        MockOpenvasDB.get_list_item.side_effect = [metadata, prefs1]
+        MockOpenvasDB.get_list_items.return_value = [metadata, prefs1]
         resp = self.nvti.get_nvt_metadata('1.2.3.4')
         self.maxDiff = None
         self.assertEqual(resp, custom)
+        MockOpenvasDB.get_list_items.assert_called_once_with(
+            'foo',
+            [(b'nvt:1.2.3.4', 0, 13), (b'oid:1.2.3.4:prefs', 0, -1)],
+        )
 
     def test_get_nvt_metadata_fail(self, MockOpenvasDB):
-        MockOpenvasDB.get_list_item.return_value = []
+        MockOpenvasDB.get_list_items.return_value = [[], []]
+
+        resp = self.nvti.get_nvt_metadata('1.2.3.4')
+
+        self.assertIsNone(resp)
+
+    def test_get_nvt_metadata_incomplete(self, MockOpenvasDB):
+        logging.Logger.error = Mock()
+
+        MockOpenvasDB.get_list_items.return_value = [['foo.nasl', ''], []]
 
         resp = self.nvti.get_nvt_metadata('1.2.3.4')
 
         self.assertIsNone(resp)
+        assert_called(logging.Logger.error)
+
+    def test_get_nvts_bulk(self, MockOpenvasDB):
+        metadata = [
+            'foo.nasl',
+            '',
+            '',
+            '',
+            '',
+            '',
+            '',
+            'last_modification=1533906565|creation_date=1237458156',
+            '',
+            '',
+            '',
+            '3',
+            'Product detection',
+            'Foo',
+        ]
+        prefs = ['0|||timeout|||entry|||10']
+
+        MockOpenvasDB.get_list_items.return_value = [metadata, prefs, [], []]
+
+        resp = list(self.nvti.get_nvts_bulk(['1.2.3.4', '1.2.3.5']))
+
+        self.assertEqual(len(resp), 2)
+        oid, custom = resp[0]
+        self.assertEqual(oid, '1.2.3.4')
+        self.assertEqual(custom['filename'], 'foo.nasl')
+        self.assertEqual(custom['last_modification'], '1533906565')
+        self.assertEqual(custom['vt_params']['0']['default'], '10')
+        self.assertEqual(resp[1], ('1.2.3.5', None))
+
+        MockOpenvasDB.get_list_items.assert_called_once_with(
+            'foo',
+            [
+                (b'nvt:1.2.3.4', 0, 13),
+                (b'oid:1.2.3.4:prefs', 0, -1),
+                (b'nvt:1.2.3.5', 0, 13),
+                (b'oid:1.2.3.5:prefs', 0, -1),
+            ],
+        )
+
+    def test_get_nvts_bulk_chunks(self, MockOpenvasDB):
+        MockOpenvasDB.get_list_items.return_value = [[], []]
+
+        resp = list(self.nvti.get_nvts_bulk(['1', '2', '3'], chunk=1))
+
+        self.assertEqual(resp, [('1', None), ('2', None), ('3', None)])
+        self.assertEqual(MockOpenvasDB.get_list_items.call_count, 3)
 
     def test_get_nvt_refs(self, MockOpenvasDB):
         refs = ['', '', 'URL:http://www.mantisbt.org/']
@@ -243,6 +362,16 @@ class TestNVTICache(TestCase):
 
         self.assertIsNone(resp)
 
+    def test_get_nvt_families(self, MockOpenvasDB):
+        MockOpenvasDB.get_list_items.return_value = [['debian'], []]
+
+        resp = list(self.nvti.get_nvt_families(['1.2.3.4', '1.2.3.5']))
+
+        self.assertEqual(resp, [('1.2.3.4', 'debian'), ('1.2.3.5', None)])
+        MockOpenvasDB.get_list_items.assert_called_once_with(
+            'foo', [(b'nvt:1.2.3.4', 12, 12), (b'nvt:1.2.3.5', 12, 12)]
+        )
+
     def test_get_nvt_prefs(self, MockOpenvasDB):
         prefs = ['dns-fuzz.timelimit|||entry|||default']
 
@@ -277,6 +406,16 @@ class TestNVTICache(TestCase):
 
         self.assertEqual(out_dict, resp)
 
+    def test_get_nvt_tags_missing_value(self, MockOpenvasDB):
+        logging.Logger.error = Mock()
+
+        MockOpenvasDB.get_single_item.return_value = 'foo|qod_type=package'
+
+        resp = self.nvti.get_nvt_tags('1.2.3.4')
+
+        self.assertEqual(resp, {'qod_type': 'package'})
+        assert_called(logging.Logger.error)
+
     def test_get_nvt_files_count(self, MockOpenvasDB):
         MockOpenvasDB.get_key_count.return_value = 20
 
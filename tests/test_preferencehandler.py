@@ -94,6 +94,42 @@ class PreferenceHandlerTestCase(TestCase):
 
         self.assertEqual(ret, vt_out)
 
+    def test_get_vts_in_groups(self):
+        dummy = DummyDaemon()
+        dummy.nvti.get_oids.return_value = [
+            ('foo.nasl', '1.2.3.4'),
+            ('bar.nasl', '1.2.3.5'),
+            ('baz.nasl', '1.2.3.6'),
+        ]
+        dummy.nvti.get_nvt_families.return_value = [
+            ('1.2.3.4', 'debian'),
+            ('1.2.3.5', 'general'),
+            ('1.2.3.6', 'debian'),
+        ]
+
+        p_handler = PreferenceHandler(
+            '1234-1234', None, dummy.scan_collection, dummy.nvti, None
+        )
+        ret = p_handler._get_vts_in_groups(  # pylint: disable=protected-access
+            ['family=debian']
+        )
+
+        self.assertEqual(ret, ['1.2.3.4', '1.2.3.6'])
+
+    def test_openvas_settings_read_once(self):
+        dummy = DummyDaemon()
+
+        p_handler = PreferenceHandler(
+            '1234-1234', None, dummy.scan_collection, None, None
+        )
+        with patch.object(
+            Openvas, 'get_settings', return_value={'foo': 'bar'}
+        ) as mock_get_settings:
+            self.assertEqual(p_handler.openvas_settings, {'foo': 'bar'})
+            self.assertEqual(p_handler.openvas_settings, {'foo': 'bar'})
+
+        assert_called_once(mock_get_settings)
+
     @patch('ospd_openvas.db.KbDB')
     def test_set_plugins_false(self, mock_kb):
         dummy = DummyDaemon()
@@ -4,6 +4,7 @@
 # SPDX-License-Identifier: AGPL-3.0-or-later
 
 
+from copy import deepcopy
 from hashlib import sha256
 from unittest import TestCase
 from unittest.mock import MagicMock, patch
@@ -101,6 +102,40 @@ class VtHelperTestCase(TestCase):
         for key, _ in vthelper.get_vt_iterator():
             self.assertIn(key, vt)
 
+        assert_called_once(dummy.nvti.get_nvts_bulk)
+
+    def test_get_vt_iterator_notus_first(self):
+        metadata = DummyDaemon().nvti.get_nvt_metadata('1.3')
+        nvti = MagicMock()
+        nvti.get_nvts_bulk.side_effect = lambda oids: (
+            (oid, deepcopy(metadata)) for oid in oids
+        )
+        notus = MagicMock()
+        notus.get_oids.return_value = []
+        notus.get_nvt_metadata.side_effect = lambda oid: (
+            deepcopy(metadata) if oid == '1.2' else None
+        )
+        vthelper = VtHelper(nvti, notus)
+
+        res = list(vthelper.get_vt_iterator(vt_selection=['1.3', '1.2']))
+
+        self.assertEqual([key for key, _ in res], ['1.2', '1.3'])
+        nvti.get_nvts_bulk.assert_called_once_with(['1.3'])
+
+    def test_get_vt_iterator_duplicate_vt(self):
+        metadata = DummyDaemon().nvti.get_nvt_metadata('1.2')
+        nvti = MagicMock()
+        nvti.get_nvts_bulk.side_effect = lambda oids: {
+            oid: deepcopy(metadata) for oid in oids
+        }.items()
+        vthelper = VtHelper(nvti)
+
+        res = list(vthelper.get_vt_iterator(vt_selection=['1.2', '1.2']))
+
+        self.assertEqual([key for key, _ in res], ['1.2', '1.2'])
+        self.assertEqual(res[0][1], res[1][1])
+        self.assertEqual(res[1][1].get('name'), 'Mantis Detection')
+
     def test_get_vt_iterator_with_filter(self):
         dummy = DummyDaemon()
         vthelper = VtHelper(dummy.nvti)